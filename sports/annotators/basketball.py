@@ -1,4 +1,4 @@
-from typing import Optional, List
+from typing import Optional, List, Tuple
 
 import cv2
 import supervision as sv
@@ -16,20 +16,23 @@ def draw_court(
     hoop_radius: int = 6,
     point_radius: int = 5,
     scale: float = 10.0,
-    show_labels: bool = False
+    show_labels: bool = False,
+    out: Optional[np.ndarray] = None
 ) -> np.ndarray:
     """
     Draw basketball court using BasketballCourtConfiguration.
+
+    If `out` is given, the court is drawn into it in place and no new image is
+    allocated.
     """
 
-    scaled_width = int(config.width * scale)
-    scaled_length = int(config.length * scale)
+    shape = get_court_shape(config=config, padding=padding, scale=scale)
 
-    court = np.ones(
-        (scaled_width + 2 * padding,
-         scaled_length + 2 * padding, 3),
-        dtype=np.uint8
-    ) * np.array(background_color.as_bgr(), dtype=np.uint8)
+    if out is None:
+        court = np.empty(shape, dtype=np.uint8)
+    else:
+        court = _check_out(out, shape)
+    court[:] = background_color.as_bgr()
 
     # Draw edges
     for start, end in config.edges:
@@ -96,6 +99,51 @@ def draw_court(
     return court
 
 
+def get_court_shape(
+    config: BasketballCourtConfiguration,
+    padding: int = 50,
+    scale: float = 10.0
+) -> Tuple[int, int, int]:
+    """
+    Return the (height, width, channels) shape of a court image drawn with the
+    given padding and scale.
+    """
+    return (
+        int(config.width * scale) + 2 * padding,
+        int(config.length * scale) + 2 * padding,
+        3
+    )
+
+
+def _check_out(out: np.ndarray, shape: Tuple[int, ...]) -> np.ndarray:
+    if out.shape != tuple(shape) or out.dtype != np.uint8:
+        raise ValueError(
+            f"Output buffer must be a uint8 array of shape {tuple(shape)}, "
+            f"got {out.dtype} array of shape {out.shape}.")
+    return out
+
+
+def _prepare_court(
+    config: BasketballCourtConfiguration,
+    padding: int,
+    scale: float,
+    court: Optional[np.ndarray],
+    out: Optional[np.ndarray]
+) -> np.ndarray:
+    if out is None:
+        if court is None:
+            court = draw_court(config=config, padding=padding, scale=scale)
+        return court
+
+    if court is None:
+        return draw_court(config=config, padding=padding, scale=scale, out=out)
+
+    _check_out(out, court.shape)
+    if court is not out:
+        np.copyto(out, court)
+    return out
+
+
 def draw_points_on_court(
     config: BasketballCourtConfiguration,
     xy: np.ndarray,
@@ -105,14 +153,10 @@ def draw_points_on_court(
     thickness: int = 2,
     padding: int = 50,
     scale: float = 10,
-    court: Optional[np.ndarray] = None
+    court: Optional[np.ndarray] = None,
+    out: Optional[np.ndarray] = None
 ) -> np.ndarray:
-    if court is None:
-        court = draw_court(
-            config=config,
-            padding=padding,
-            scale=scale
-        )
+    court = _prepare_court(config, padding, scale, court, out)
 
     for point in xy:
         scaled_point = (
@@ -131,14 +175,10 @@ def draw_paths_on_court(
     thickness: int = 2,
     padding: int = 50,
     scale: float = 10,
-    court: Optional[np.ndarray] = None
+    court: Optional[np.ndarray] = None,
+    out: Optional[np.ndarray] = None
 ) -> np.ndarray:
-    if court is None:
-        court = draw_court(
-            config=config,
-            padding=padding,
-            scale=scale
-        )
+    court = _prepare_court(config, padding, scale, court, out)
 
     for path in paths:
         scaled_path = [
@@ -161,6 +201,89 @@ def draw_paths_on_court(
     return court
 
 
+def _nearest_squared_distance(
+    xy: np.ndarray,
+    scale: float,
+    x_coords: np.ndarray,
+    y_coords: np.ndarray,
+    dx: np.ndarray,
+    dy: np.ndarray,
+    buffer: np.ndarray,
+    out: np.ndarray
+) -> np.ndarray:
+    """
+    Write the squared pixel distance to the nearest of `xy` into `out`.
+
+    The distance separates into a column term and a row term, so only 1D
+    differences are computed per point and broadcast into `buffer`.
+    """
+    out.fill(np.inf)
+    for x, y in xy:
+        np.subtract(x_coords, x * scale, out=dx)
+        np.square(dx, out=dx)
+        np.subtract(y_coords, y * scale, out=dy)
+        np.square(dy, out=dy)
+        np.add(dy[:, None], dx[None, :], out=buffer)
+        np.minimum(out, buffer, out=out)
+    return out
+
+
+class VoronoiBuffers:
+    """
+    Scratch buffers for drawing a Voronoi diagram onto a court of fixed shape.
+
+    Pass one instance to repeated `draw_court_voronoi_diagram` calls to reuse
+    its scratch space instead of allocating it on every call.
+
+    Attributes:
+        shape (Tuple[int, int, int]): Shape of the court the buffers fit.
+        padding (int): Padding around the court in pixels.
+    """
+
+    def __init__(self, shape: Tuple[int, int, int], padding: int):
+        self.shape = tuple(shape)
+        self.padding = padding
+        height, width = shape[:2]
+        self.x_coords = np.arange(width, dtype=np.float32) - padding
+        self.y_coords = np.arange(height, dtype=np.float32) - padding
+        self.dx = np.empty(width, dtype=np.float32)
+        self.dy = np.empty(height, dtype=np.float32)
+        self.buffer = np.empty((height, width), dtype=np.float32)
+        self.d1 = np.empty((height, width), dtype=np.float32)
+        self.d2 = np.empty((height, width), dtype=np.float32)
+        self.mask = np.empty((height, width), dtype=bool)
+        self.voronoi = np.empty(shape, dtype=np.uint8)
+
+    def draw(
+        self,
+        court: np.ndarray,
+        team_1_xy: np.ndarray,
+        team_2_xy: np.ndarray,
+        team_1_color: sv.Color,
+        team_2_color: sv.Color,
+        opacity: float,
+        scale: float,
+        out: np.ndarray
+    ) -> np.ndarray:
+        _nearest_squared_distance(
+            team_1_xy, scale, self.x_coords, self.y_coords,
+            self.dx, self.dy, self.buffer, self.d1)
+        _nearest_squared_distance(
+            team_2_xy, scale, self.x_coords, self.y_coords,
+            self.dx, self.dy, self.buffer, self.d2)
+
+        np.less(self.d1, self.d2, out=self.mask)
+        self.voronoi[:] = team_2_color.as_bgr()
+        np.copyto(
+            self.voronoi,
+            np.array(team_1_color.as_bgr(), dtype=np.uint8),
+            where=self.mask[..., None]
+        )
+
+        return cv2.addWeighted(
+            self.voronoi, opacity, court, 1 - opacity, 0, dst=out)
+
+
 def draw_court_voronoi_diagram(
     config: BasketballCourtConfiguration,
     team_1_xy: np.ndarray,
@@ -170,8 +293,16 @@ def draw_court_voronoi_diagram(
     opacity: float = 0.5,
     padding: int = 50,
     scale: float = 10,
-    court: Optional[np.ndarray] = None
+    court: Optional[np.ndarray] = None,
+    out: Optional[np.ndarray] = None,
+    buffers: Optional[VoronoiBuffers] = None
 ) -> np.ndarray:
+    """
+    Shade the court by the team of the nearest player.
+
+    With both `court` and `out` given and a reused `buffers`, the call allocates
+    no images.
+    """
     if court is None:
         court = draw_court(
             config=config,
@@ -179,30 +310,210 @@ def draw_court_voronoi_diagram(
             scale=scale
         )
 
-    scaled_width = int(config.width * scale)
-    scaled_length = int(config.length * scale)
-
-    voronoi = np.zeros_like(court, dtype=np.uint8)
+    if out is None:
+        out = np.empty_like(court)
+    else:
+        _check_out(out, court.shape)
+
+    if buffers is None:
+        buffers = VoronoiBuffers(court.shape, padding)
+    elif buffers.shape != court.shape or buffers.padding != padding:
+        raise ValueError(
+            f"Voronoi buffers were created for shape {buffers.shape} and padding "
+            f"{buffers.padding}, got shape {court.shape} and padding {padding}.")
+
+    return buffers.draw(
+        court=court,
+        team_1_xy=team_1_xy,
+        team_2_xy=team_2_xy,
+        team_1_color=team_1_color,
+        team_2_color=team_2_color,
+        opacity=opacity,
+        scale=scale,
+        out=out
+    )
 
-    y_coords, x_coords = np.indices((
-        scaled_width + 2 * padding,
-        scaled_length + 2 * padding
-    ))
 
-    y_coords -= padding
-    x_coords -= padding
+class CourtRenderer:
+    """
+    A minimap renderer bound to one court configuration and scale.
+
+    The static court is drawn once and every buffer needed to render a frame is
+    allocated up front, so steady-state rendering allocates no images.
+
+    Attributes:
+        config (BasketballCourtConfiguration): The court configuration.
+        padding (int): Padding around the court in pixels.
+        scale (float): Pixels per court unit.
+        court (np.ndarray): The pre-drawn empty court.
+        canvas (np.ndarray): The buffer the minimap is rendered into when no
+            output buffer is given.
+    """
 
-    def distances(xy):
-        return np.sqrt(
-            (xy[:, 0][:, None, None] * scale - x_coords) ** 2 +
-            (xy[:, 1][:, None, None] * scale - y_coords) ** 2
+    def __init__(
+        self,
+        config: BasketballCourtConfiguration,
+        padding: int = 50,
+        scale: float = 10,
+        team_1_color: sv.Color = sv.Color.RED,
+        team_2_color: sv.Color = sv.Color.BLUE,
+        ball_color: sv.Color = sv.Color.WHITE,
+        edge_color: sv.Color = sv.Color.BLACK,
+        radius: int = 10,
+        thickness: int = 2,
+        opacity: float = 0.5
+    ):
+        self.config = config
+        self.padding = padding
+        self.scale = scale
+        self.team_1_color = team_1_color
+        self.team_2_color = team_2_color
+        self.ball_color = ball_color
+        self.edge_color = edge_color
+        self.radius = radius
+        self.thickness = thickness
+        self.opacity = opacity
+
+        self.court = draw_court(config=config, padding=padding, scale=scale)
+        self.canvas = np.empty_like(self.court)
+        self._voronoi = VoronoiBuffers(self.court.shape, padding)
+
+    @property
+    def shape(self) -> Tuple[int, int, int]:
+        """
+        The (height, width, channels) shape of the rendered minimap.
+        """
+        return self.court.shape
+
+    def get_composite_shape(
+        self,
+        frame_shape: Tuple[int, ...]
+    ) -> Tuple[int, int, int]:
+        """
+        Return the shape of the output frame expected by `composite`.
+
+        Args:
+            frame_shape (Tuple[int, ...]): Shape of the video frame.
+
+        Returns:
+            Tuple[int, int, int]: Shape fitting the frame and the minimap side
+                by side.
+        """
+        height, width = self.shape[:2]
+        return (
+            max(frame_shape[0], height),
+            frame_shape[1] + width,
+            3
         )
 
-    d1 = np.min(distances(team_1_xy), axis=0)
-    d2 = np.min(distances(team_2_xy), axis=0)
-
-    mask = d1 < d2
-    voronoi[mask] = team_1_color.as_bgr()
-    voronoi[~mask] = team_2_color.as_bgr()
+    def _draw_points(
+        self,
+        court: np.ndarray,
+        xy: Optional[np.ndarray],
+        color: sv.Color,
+        radius: int
+    ) -> None:
+        if xy is None:
+            return
+        draw_points_on_court(
+            config=self.config,
+            xy=xy,
+            face_color=color,
+            edge_color=self.edge_color,
+            radius=radius,
+            thickness=self.thickness,
+            padding=self.padding,
+            scale=self.scale,
+            court=court
+        )
 
-    return cv2.addWeighted(voronoi, opacity, court, 1 - opacity, 0)
+    def render(
+        self,
+        team_1_xy: np.ndarray,
+        team_2_xy: np.ndarray,
+        ball_xy: Optional[np.ndarray] = None,
+        voronoi: bool = False,
+        out: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """
+        Render the minimap for one frame.
+
+        Args:
+            team_1_xy (np.ndarray): Court coordinates of team 1 players.
+            team_2_xy (np.ndarray): Court coordinates of team 2 players.
+            ball_xy (Optional[np.ndarray]): Court coordinates of the ball.
+            voronoi (bool): Whether to shade the court by nearest team.
+            out (Optional[np.ndarray]): Buffer of shape `shape` to render the
+                minimap into; it may be a view into a larger frame. If None, the
+                internal canvas is returned and is overwritten by the next call.
+
+        Returns:
+            np.ndarray: The rendered minimap.
+        """
+        target = self.canvas if out is None else _check_out(out, self.shape)
+
+        if voronoi:
+            draw_court_voronoi_diagram(
+                config=self.config,
+                team_1_xy=team_1_xy,
+                team_2_xy=team_2_xy,
+                team_1_color=self.team_1_color,
+                team_2_color=self.team_2_color,
+                opacity=self.opacity,
+                padding=self.padding,
+                scale=self.scale,
+                court=self.court,
+                out=target,
+                buffers=self._voronoi
+            )
+        else:
+            np.copyto(target, self.court)
+
+        self._draw_points(target, team_1_xy, self.team_1_color, self.radius)
+        self._draw_points(target, team_2_xy, self.team_2_color, self.radius)
+        self._draw_points(
+            target, ball_xy, self.ball_color, max(self.radius // 2, 1))
+        return target
+
+    def composite(
+        self,
+        frame: np.ndarray,
+        out: np.ndarray,
+        team_1_xy: np.ndarray,
+        team_2_xy: np.ndarray,
+        ball_xy: Optional[np.ndarray] = None,
+        voronoi: bool = False
+    ) -> np.ndarray:
+        """
+        Place the frame and its minimap side by side into `out`.
+
+        Args:
+            frame (np.ndarray): The video frame.
+            out (np.ndarray): Output buffer of shape
+                `get_composite_shape(frame.shape)`.
+            team_1_xy (np.ndarray): Court coordinates of team 1 players.
+            team_2_xy (np.ndarray): Court coordinates of team 2 players.
+            ball_xy (Optional[np.ndarray]): Court coordinates of the ball.
+            voronoi (bool): Whether to shade the court by nearest team.
+
+        Returns:
+            np.ndarray: The composited output frame.
+
+        Raises:
+            ValueError: If `out` does not have the expected shape.
+        """
+        _check_out(out, self.get_composite_shape(frame.shape))
+        frame_height, frame_width = frame.shape[:2]
+        height, width = self.shape[:2]
+
+        out[:frame_height, :frame_width] = frame
+        out[frame_height:, :frame_width] = 0
+        self.render(
+            team_1_xy=team_1_xy,
+            team_2_xy=team_2_xy,
+            ball_xy=ball_xy,
+            voronoi=voronoi,
+            out=out[:height, frame_width:]
+        )
+        out[height:, frame_width:] = 0
+        return out
@@ -0,0 +1,285 @@
+from typing import List, Optional, Tuple
+
+import numpy as np
+import numpy.typing as npt
+
+
+def stack_sequence(
+    values: List[np.ndarray],
+    fill_value: float = np.nan,
+    ids: Optional[List[np.ndarray]] = None
+) -> np.ndarray:
+    """
+    Stack per-frame arrays of varying length into one padded array.
+
+    Without `ids`, rows are padded in detection order, so column j is only the
+    same player across frames if the detector happens to keep the order. Pass
+    the per-frame `tracker_id` arrays as `ids` to give every track its own
+    column; column j then holds the track with the j-th smallest id, i.e.
+    `np.unique(np.concatenate(ids))[j]`.
+
+    Args:
+        values (List[np.ndarray]): Per-frame arrays, e.g. court coordinates of shape
+            (N_t, 2) or team labels of shape (N_t,).
+        fill_value (float): Value used for padding missing entries. Use np.nan for
+            coordinates and -1 for team labels. Empty frames do not take part in
+            picking the dtype, so the empty float arrays `TeamClassifier.predict`
+            returns for frames without crops do not turn labels into floats.
+        ids (Optional[List[np.ndarray]]): Per-frame ids of shape (N_t,) assigning
+            each row to a column.
+
+    Returns:
+        np.ndarray: Array of shape (T, N, ...) where N is the largest N_t, or the
+            number of distinct ids if `ids` is given.
+
+    Raises:
+        ValueError: If `ids` does not match `values` frame by frame.
+    """
+    non_empty = [value for value in values if len(value) > 0]
+    if non_empty:
+        tail = non_empty[0].shape[1:]
+    else:
+        tail = values[0].shape[1:] if values else ()
+    dtype = np.result_type(fill_value, *non_empty)
+
+    lengths = np.array([len(value) for value in values], dtype=int)
+    rows = np.repeat(np.arange(len(values)), lengths)
+    if ids is None:
+        length = lengths.max(initial=0)
+        columns = np.arange(len(rows)) - np.repeat(
+            np.cumsum(lengths) - lengths, lengths)
+    else:
+        if len(ids) != len(values) or any(
+                len(frame_ids) != len(value)
+                for frame_ids, value in zip(ids, values)):
+            raise ValueError("Ids must match values frame by frame.")
+        flat_ids = np.concatenate(
+            [np.asarray(frame_ids) for frame_ids in ids] + [np.array([], dtype=int)])
+        unique_ids, columns = np.unique(flat_ids, return_inverse=True)
+        length = len(unique_ids)
+
+    stacked = np.full((len(values), length) + tail, fill_value, dtype=dtype)
+    if non_empty:
+        stacked[rows, columns] = np.concatenate(non_empty)
+    return stacked
+
+
+def _pairwise_distances(xy: np.ndarray) -> np.ndarray:
+    delta = xy[:, :, None, :] - xy[:, None, :, :]
+    return np.sqrt(np.einsum('tijk,tijk->tij', delta, delta))
+
+
+def pairwise_distances(
+    xy: npt.NDArray[np.float32],
+    chunk_size: int = 1024
+) -> npt.NDArray[np.float32]:
+    """
+    Compute per-frame pairwise distances between players.
+
+    Args:
+        xy (npt.NDArray[np.float32]): Player coordinates of shape (T, N, 2), NaN for
+            missing players.
+        chunk_size (int): Number of frames processed at once, bounding the size
+            of intermediate arrays.
+
+    Returns:
+        npt.NDArray[np.float32]: Distances of shape (T, N, N), NaN where either
+            player is missing.
+
+    Raises:
+        ValueError: If xy is not of shape (T, N, 2).
+    """
+    if xy.ndim != 3 or xy.shape[2] != 2:
+        raise ValueError("Points must be of shape (T, N, 2).")
+
+    chunk_size = max(chunk_size, 1)
+    distances = np.empty(
+        xy.shape[:2] + xy.shape[1:2], dtype=np.result_type(xy, np.float32))
+    for start in range(0, len(xy), chunk_size):
+        stop = start + chunk_size
+        distances[start:stop] = _pairwise_distances(xy[start:stop])
+    return distances
+
+
+def closest_opponent_distance(
+    xy: npt.NDArray[np.float32],
+    teams: np.ndarray,
+    chunk_size: int = 1024
+) -> npt.NDArray[np.float32]:
+    """
+    Compute the distance from each player to the closest player of another team.
+
+    Args:
+        xy (npt.NDArray[np.float32]): Player coordinates of shape (T, N, 2), NaN for
+            missing players.
+        teams (np.ndarray): Team labels of shape (T, N), -1 for missing players.
+        chunk_size (int): Number of frames processed at once, bounding the size
+            of intermediate arrays.
+
+    Returns:
+        npt.NDArray[np.float32]: Distances of shape (T, N), NaN where the player is
+            missing or has no opponent in the frame.
+
+    Raises:
+        ValueError: If xy and teams do not describe the same players.
+    """
+    if xy.ndim != 3 or xy.shape[2] != 2:
+        raise ValueError("Points must be of shape (T, N, 2).")
+    if teams.shape != xy.shape[:2]:
+        raise ValueError("Teams must be of shape (T, N) matching points.")
+
+    chunk_size = max(chunk_size, 1)
+    closest = np.empty(xy.shape[:2], dtype=np.result_type(xy, np.float32))
+    for start in range(0, len(xy), chunk_size):
+        stop = start + chunk_size
+        distances = _pairwise_distances(xy[start:stop])
+        chunk_teams = teams[start:stop]
+        valid = chunk_teams >= 0
+        opponents = (
+            (chunk_teams[:, :, None] != chunk_teams[:, None, :]) &
+            valid[:, :, None] & valid[:, None, :]
+        )
+        distances[~opponents | np.isnan(distances)] = np.inf
+        closest[start:stop] = distances.min(axis=2, initial=np.inf)
+    closest[np.isinf(closest)] = np.nan
+    return closest
+
+
+def find_runs(
+    values: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Find runs of consecutive equal values.
+
+    Args:
+        values (np.ndarray): One dimensional array of labels.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: Start index, length and value of
+            each run.
+    """
+    if len(values) == 0:
+        empty = np.array([], dtype=int)
+        return empty, empty, values[:0]
+
+    starts = np.flatnonzero(np.r_[True, values[1:] != values[:-1]])
+    lengths = np.diff(np.r_[starts, len(values)])
+    return starts, lengths, values[starts]
+
+
+def assign_ball_possession(
+    ball_xy: npt.NDArray[np.float32],
+    xy: npt.NDArray[np.float32],
+    max_distance: float = 5.0,
+    min_frames: int = 5
+) -> np.ndarray:
+    """
+    Assign the ball to the nearest player in every frame, with hysteresis.
+
+    A change of holder, including losing the ball, is only accepted once it has
+    persisted for `min_frames` consecutive frames; shorter runs keep the previous
+    holder. Player columns of `xy` must refer to the same player across frames,
+    e.g. be built with `stack_sequence(..., ids=tracker_ids)`.
+
+    Args:
+        ball_xy (npt.NDArray[np.float32]): Ball coordinates of shape (T, 2), NaN
+            when the ball is not detected.
+        xy (npt.NDArray[np.float32]): Player coordinates of shape (T, N, 2), NaN for
+            missing players.
+        max_distance (float): Maximum ball to player distance for possession.
+        min_frames (int): Minimum number of frames for a change of holder.
+
+    Returns:
+        np.ndarray: Index of the player in possession for every frame, -1 when no
+            player has the ball.
+
+    Raises:
+        ValueError: If ball_xy and xy do not have matching shapes.
+    """
+    if xy.ndim != 3 or xy.shape[2] != 2:
+        raise ValueError("Points must be of shape (T, N, 2).")
+    if ball_xy.shape != (xy.shape[0], 2):
+        raise ValueError("Ball points must be of shape (T, 2) matching points.")
+
+    if xy.shape[1] == 0:
+        return np.full(len(xy), -1, dtype=int)
+
+    distances = np.linalg.norm(xy - ball_xy[:, None, :], axis=2)
+    distances = np.where(np.isnan(distances), np.inf, distances)
+    nearest = np.argmin(distances, axis=1)
+    within = distances[np.arange(len(xy)), nearest] <= max_distance
+    candidate = np.where(within, nearest, -1)
+
+    # Forward-fill from the start of the latest run long enough to be accepted.
+    starts, lengths, _ = find_runs(candidate)
+    index = np.full(len(candidate), -1)
+    accepted = starts[lengths >= min_frames]
+    index[accepted] = accepted
+    run_starts = np.maximum.accumulate(index)
+    return np.where(run_starts >= 0, candidate[run_starts], -1)
+
+
+def player_teams(
+    teams: np.ndarray
+) -> np.ndarray:
+    """
+    Assign every player the team label they get in most frames.
+
+    Columns must refer to the same player across frames, e.g. be built with
+    `stack_sequence(..., ids=tracker_ids)`.
+
+    Args:
+        teams (np.ndarray): Team labels of shape (T, N), -1 for missing players.
+
+    Returns:
+        np.ndarray: Team label of shape (N,), -1 for players never labelled.
+    """
+    labels = np.unique(teams[teams >= 0])
+    if len(labels) == 0:
+        return np.full(teams.shape[1], -1, dtype=int)
+
+    counts = (teams[:, :, None] == labels).sum(axis=0)
+    return np.where(counts.max(axis=1) > 0, labels[counts.argmax(axis=1)], -1)
+
+
+def team_possession(
+    holder: np.ndarray,
+    teams: np.ndarray
+) -> np.ndarray:
+    """
+    Map per-frame ball holders to their teams.
+
+    Each player's team is the majority label over the sequence, so frames where
+    the holder is occluded or misclassified keep the holder's team.
+
+    Args:
+        holder (np.ndarray): Player index in possession of shape (T,), -1 for none.
+        teams (np.ndarray): Team labels of shape (T, N), -1 for missing players.
+
+    Returns:
+        np.ndarray: Team in possession for every frame, -1 when no team has the
+            ball.
+    """
+    if teams.shape[1] == 0:
+        return np.full(len(holder), -1, dtype=int)
+
+    team = player_teams(teams)[np.maximum(holder, 0)]
+    return np.where(holder >= 0, team, -1)
+
+
+def possession_runs(
+    team: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Find the team possession runs over a sequence.
+
+    Args:
+        team (np.ndarray): Team in possession for every frame, -1 for none.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: Start frame, length and team of
+            each possession, excluding frames where no team has the ball.
+    """
+    starts, lengths, values = find_runs(team)
+    mask = values >= 0
+    return starts[mask], lengths[mask], values[mask]
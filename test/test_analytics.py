@@ -0,0 +1,178 @@
+import numpy as np
+import pytest
+
+from sports.common.analytics import (
+    assign_ball_possession,
+    closest_opponent_distance,
+    pairwise_distances,
+    player_teams,
+    possession_runs,
+    stack_sequence,
+    team_possession
+)
+
+
+def _sequence(holders):
+    """
+    Build a two-player sequence where the ball sits on the given holder, or far
+    from both players where the holder is -1.
+    """
+    xy = np.tile(
+        np.array([[0.0, 0.0], [50.0, 0.0]], dtype=np.float32),
+        (len(holders), 1, 1)
+    )
+    ball_xy = np.array(
+        [xy[0, holder] if holder >= 0 else [25.0, 40.0] for holder in holders],
+        dtype=np.float32
+    ).reshape(-1, 2)
+    return ball_xy, xy
+
+
+@pytest.mark.parametrize(
+    "holders, expected",
+    [
+        ([0] * 6 + [1] * 2 + [0] * 6, [0] * 14),  # short switch ignored
+        ([0] * 6 + [1] * 6, [0] * 6 + [1] * 6),  # long switch accepted
+        ([0] * 6 + [-1] * 3 + [0] * 6, [0] * 15),  # short ball loss bridged
+        ([-1] * 2 + [1] * 6, [-1] * 2 + [1] * 6),  # nobody holds it at first
+        ([], []),
+    ]
+)
+def test_assign_ball_possession(holders, expected):
+    ball_xy, xy = _sequence(holders)
+    result = assign_ball_possession(ball_xy, xy, max_distance=5, min_frames=5)
+    np.testing.assert_array_equal(result, expected)
+
+
+def test_team_possession_bridges_holder_gap():
+    holder = np.array([0] * 10 + [2] * 3)
+    teams = np.tile(np.array([0, 0, 1]), (13, 1))
+    teams[5:7, 0] = -1  # holder occluded
+    teams[11, 2] = 0  # classifier noise
+
+    team = team_possession(holder, teams)
+    starts, lengths, values = possession_runs(team)
+
+    np.testing.assert_array_equal(team, [0] * 10 + [1] * 3)
+    np.testing.assert_array_equal(starts, [0, 10])
+    np.testing.assert_array_equal(lengths, [10, 3])
+    np.testing.assert_array_equal(values, [0, 1])
+
+
+def test_possession_runs_skip_no_possession():
+    starts, lengths, values = possession_runs(np.array([-1, 0, 0, -1, 1]))
+    np.testing.assert_array_equal(starts, [1, 4])
+    np.testing.assert_array_equal(lengths, [2, 1])
+    np.testing.assert_array_equal(values, [0, 1])
+
+
+def test_closest_opponent_distance():
+    xy = np.array([
+        [[0, 0], [3, 4], [6, 8], [np.nan, np.nan]],
+        [[0, 0], [1, 0], [np.nan, np.nan], [np.nan, np.nan]],
+    ], dtype=np.float32)
+    teams = np.array([
+        [0, 1, 1, -1],
+        [0, 0, -1, -1],
+    ])
+
+    result = closest_opponent_distance(xy, teams)
+
+    np.testing.assert_allclose(result, [
+        [5, 5, 10, np.nan],
+        [np.nan, np.nan, np.nan, np.nan],
+    ])
+
+
+def test_stack_sequence_pads_coordinates():
+    result = stack_sequence([
+        np.ones((2, 2), dtype=np.float32),
+        np.empty((0, 2), dtype=np.float32),
+    ])
+    assert result.shape == (2, 2, 2)
+    assert result.dtype == np.float32
+    assert np.isnan(result[1]).all()
+
+
+def test_stack_sequence_all_empty_frames():
+    result = stack_sequence([np.empty((0, 2)), np.empty((0, 2))])
+    assert result.shape == (2, 0, 2)
+
+
+def test_stack_sequence_keeps_labels_integer():
+    result = stack_sequence(
+        [np.array([0, 1]), np.array([]), np.array([1])], fill_value=-1)
+    assert result.dtype.kind == 'i'
+    np.testing.assert_array_equal(result, [[0, 1], [-1, -1], [1, -1]])
+
+
+def test_stack_sequence_empty():
+    assert stack_sequence([]).shape == (0, 0)
+
+
+def test_stack_sequence_aligns_by_ids():
+    result = stack_sequence(
+        [np.array([[1.0, 1.0], [2.0, 2.0]]), np.array([[3.0, 3.0]]), np.array([])],
+        ids=[np.array([7, 3]), np.array([7]), np.array([])]
+    )
+    np.testing.assert_array_equal(result, [
+        [[2, 2], [1, 1]],
+        [[np.nan, np.nan], [3, 3]],
+        [[np.nan, np.nan], [np.nan, np.nan]],
+    ])
+
+
+def test_stack_sequence_rejects_mismatched_ids():
+    with pytest.raises(ValueError):
+        stack_sequence([np.zeros((2, 2))], ids=[np.array([1])])
+
+
+def test_stack_sequence_keeps_float_coordinates_with_integer_fill():
+    result = stack_sequence(
+        [np.array([[1.5, 2.7]], dtype=np.float32), np.empty((0, 2))], fill_value=0)
+    assert result.dtype == np.float32
+    np.testing.assert_allclose(result[0], [[1.5, 2.7]])
+
+
+def test_stack_sequence_first_frame_empty():
+    result = stack_sequence([np.array([]), np.ones((3, 2))])
+    assert result.shape == (2, 3, 2)
+    assert np.isnan(result[0]).all()
+
+
+def test_possession_from_tracked_detections():
+    # Player 10 (team 0) holds the ball while detections alternate order.
+    frames = 10
+    player_xy, player_ids, player_labels = [], [], []
+    for i in range(frames):
+        xy = np.array([[0.0, 0.0], [50.0, 0.0]], dtype=np.float32)
+        ids = np.array([10, 20])
+        labels = np.array([0, 1])
+        if i % 2:
+            xy, ids, labels = xy[::-1], ids[::-1], labels[::-1]
+        player_xy.append(xy)
+        player_ids.append(ids)
+        player_labels.append(labels)
+    ball_xy = np.zeros((frames, 2), dtype=np.float32)
+
+    xy = stack_sequence(player_xy, ids=player_ids)
+    teams = stack_sequence(player_labels, fill_value=-1, ids=player_ids)
+    holder = assign_ball_possession(ball_xy, xy, max_distance=5, min_frames=3)
+
+    np.testing.assert_array_equal(holder, [0] * frames)
+    np.testing.assert_array_equal(player_teams(teams), [0, 1])
+    np.testing.assert_array_equal(team_possession(holder, teams), [0] * frames)
+
+
+def test_distances_are_chunk_independent():
+    rng = np.random.default_rng(0)
+    xy = rng.uniform(0, 50, (7, 4, 2)).astype(np.float32)
+    xy[2, 1] = np.nan
+    teams = rng.integers(0, 2, (7, 4))
+    teams[2, 1] = -1
+
+    np.testing.assert_allclose(
+        pairwise_distances(xy, chunk_size=2), pairwise_distances(xy))
+    np.testing.assert_allclose(
+        closest_opponent_distance(xy, teams, chunk_size=3),
+        closest_opponent_distance(xy, teams))
@@ -0,0 +1,173 @@
+import tracemalloc
+
+import numpy as np
+import pytest
+import supervision as sv
+
+from sports.annotators.basketball import (
+    CourtRenderer,
+    VoronoiBuffers,
+    draw_court,
+    draw_court_voronoi_diagram,
+    draw_paths_on_court,
+    draw_points_on_court,
+    get_court_shape
+)
+from sports.configs.basketball import BasketballCourtConfiguration
+
+CONFIG = BasketballCourtConfiguration()
+TEAM_1_XY = np.array([[10.0, 10.0], [30.0, 40.0], [60.0, 20.0]])
+TEAM_2_XY = np.array([[20.0, 25.0], [70.0, 35.0], [85.0, 5.0]])
+BALL_XY = np.array([[47.0, 25.0]])
+
+
+def _expected_minimap(voronoi: bool) -> np.ndarray:
+    court = draw_court(CONFIG)
+    if voronoi:
+        court = draw_court_voronoi_diagram(CONFIG, TEAM_1_XY, TEAM_2_XY, court=court)
+    court = draw_points_on_court(
+        CONFIG, TEAM_1_XY, face_color=sv.Color.RED, court=court)
+    court = draw_points_on_court(
+        CONFIG, TEAM_2_XY, face_color=sv.Color.BLUE, court=court)
+    return draw_points_on_court(
+        CONFIG, BALL_XY, face_color=sv.Color.WHITE, radius=5, court=court)
+
+
+def test_draw_court_out():
+    out = np.zeros(get_court_shape(CONFIG), dtype=np.uint8)
+    result = draw_court(CONFIG, out=out)
+    assert result is out
+    np.testing.assert_array_equal(result, draw_court(CONFIG))
+
+
+def test_draw_points_on_court_out_keeps_court():
+    court = draw_court(CONFIG)
+    original = court.copy()
+    out = np.empty_like(court)
+
+    result = draw_points_on_court(CONFIG, TEAM_1_XY, court=court, out=out)
+
+    assert result is out
+    np.testing.assert_array_equal(court, original)
+    np.testing.assert_array_equal(result, draw_points_on_court(CONFIG, TEAM_1_XY))
+
+
+def test_draw_paths_on_court_out():
+    out = np.empty(get_court_shape(CONFIG), dtype=np.uint8)
+    result = draw_paths_on_court(CONFIG, [TEAM_1_XY], out=out)
+    assert result is out
+    np.testing.assert_array_equal(result, draw_paths_on_court(CONFIG, [TEAM_1_XY]))
+
+
+def test_draw_court_voronoi_diagram_out_and_buffers():
+    court = draw_court(CONFIG)
+    out = np.empty_like(court)
+    buffers = VoronoiBuffers(court.shape, padding=50)
+    expected = draw_court_voronoi_diagram(CONFIG, TEAM_1_XY, TEAM_2_XY)
+
+    for _ in range(2):
+        result = draw_court_voronoi_diagram(
+            CONFIG, TEAM_1_XY, TEAM_2_XY, court=court, out=out, buffers=buffers)
+        assert result is out
+        np.testing.assert_array_equal(result, expected)
+
+
+@pytest.mark.parametrize(
+    "out",
+    [
+        np.empty((10, 10, 3), dtype=np.uint8),
+        np.empty(get_court_shape(CONFIG), dtype=np.float32),
+    ]
+)
+def test_draw_court_rejects_bad_out(out):
+    with pytest.raises(ValueError):
+        draw_court(CONFIG, out=out)
+
+
+def test_draw_points_on_court_rejects_bad_out():
+    with pytest.raises(ValueError):
+        draw_points_on_court(
+            CONFIG, TEAM_1_XY, court=draw_court(CONFIG),
+            out=np.empty((10, 10, 3), dtype=np.uint8))
+
+
+@pytest.mark.parametrize(
+    "shape, padding",
+    [
+        ((10, 10, 3), 50),
+        (get_court_shape(CONFIG), 10),
+    ]
+)
+def test_draw_court_voronoi_diagram_rejects_mismatched_buffers(shape, padding):
+    with pytest.raises(ValueError):
+        draw_court_voronoi_diagram(
+            CONFIG, TEAM_1_XY, TEAM_2_XY,
+            buffers=VoronoiBuffers(shape, padding=padding))
+
+
+@pytest.mark.parametrize("voronoi", [False, True])
+def test_court_renderer_render(voronoi):
+    renderer = CourtRenderer(CONFIG)
+    expected = _expected_minimap(voronoi)
+
+    result = renderer.render(TEAM_1_XY, TEAM_2_XY, BALL_XY, voronoi=voronoi)
+    assert result is renderer.canvas
+    np.testing.assert_array_equal(result, expected)
+
+    out = np.empty(renderer.shape, dtype=np.uint8)
+    result = renderer.render(
+        TEAM_1_XY, TEAM_2_XY, BALL_XY, voronoi=voronoi, out=out)
+    assert result is out
+    np.testing.assert_array_equal(result, expected)
+
+
+def test_court_renderer_render_rejects_bad_out():
+    renderer = CourtRenderer(CONFIG)
+    with pytest.raises(ValueError):
+        renderer.render(
+            TEAM_1_XY, TEAM_2_XY, out=np.empty((10, 10, 3), dtype=np.uint8))
+
+
+@pytest.mark.parametrize("frame_height", [100, 800])
+def test_court_renderer_composite_layout(frame_height):
+    renderer = CourtRenderer(CONFIG)
+    height, width = renderer.shape[:2]
+    frame = np.full((frame_height, 200, 3), 7, dtype=np.uint8)
+    out = np.full(renderer.get_composite_shape(frame.shape), 255, dtype=np.uint8)
+
+    result = renderer.composite(
+        frame, out, TEAM_1_XY, TEAM_2_XY, BALL_XY, voronoi=True)
+
+    assert result is out
+    assert out.shape == (max(frame_height, height), 200 + width, 3)
+    np.testing.assert_array_equal(out[:frame_height, :200], frame)
+    assert (out[frame_height:, :200] == 0).all()
+    np.testing.assert_array_equal(out[:height, 200:], _expected_minimap(True))
+    assert (out[height:, 200:] == 0).all()
+
+
+def test_court_renderer_composite_rejects_bad_out():
+    renderer = CourtRenderer(CONFIG)
+    frame = np.zeros((100, 200, 3), dtype=np.uint8)
+    with pytest.raises(ValueError):
+        renderer.composite(
+            frame, np.empty((100, 200, 3), dtype=np.uint8), TEAM_1_XY, TEAM_2_XY)
+
+
+def test_court_renderer_composite_allocates_no_images():
+    renderer = CourtRenderer(CONFIG)
+    frame = np.zeros((720, 1280, 3), dtype=np.uint8)
+    out = np.empty(renderer.get_composite_shape(frame.shape), dtype=np.uint8)
+    renderer.composite(frame, out, TEAM_1_XY, TEAM_2_XY, BALL_XY, voronoi=True)
+
+    tracemalloc.start()
+    try:
+        for _ in range(5):
+            renderer.composite(
+                frame, out, TEAM_1_XY, TEAM_2_XY, BALL_XY, voronoi=True)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    # A single minimap-sized temporary would be several megabytes.
+    assert peak < renderer.court.nbytes // 10